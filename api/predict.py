@@ -1,10 +1,14 @@
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.responses import Response
 from pydantic import BaseModel
 from typing import List, Dict, Any
 import os
+import time
 import joblib
 import pandas as pd
 
+from instrumentation import REGISTRY
+
 app = FastAPI(title="Fleet Model API")
 
 
@@ -15,13 +19,31 @@ class PredictRequest(BaseModel):
 MODEL_PATH = os.environ.get("MODEL_PATH", "saved_models/latest_model.joblib")
 _model = None
 
+REQUEST_LATENCY = REGISTRY.histogram(
+    "fleet_api_request_duration_seconds", "HTTP request latency in seconds.", ["method", "path", "status"]
+)
+BATCH_SIZE = REGISTRY.histogram(
+    "fleet_api_predict_batch_size", "Number of rows per /predict request.",
+    buckets=(1, 5, 10, 50, 100, 500, 1000, 5000, 10000),
+)
+PREDICT_SECONDS_PER_ROW = REGISTRY.histogram(
+    "fleet_api_predict_seconds_per_row", "Model predict time divided by batch size.",
+    buckets=(1e-6, 1e-5, 5e-5, 1e-4, 5e-4, 1e-3, 5e-3, 1e-2, 5e-2, 0.1),
+)
+PREDICT_ERRORS = REGISTRY.counter("fleet_api_predict_errors", "Failed /predict calls.")
+MODEL_LOAD_SECONDS = REGISTRY.gauge("fleet_api_model_load_seconds", "Time taken by the last model load.")
+MODEL_LOADED = REGISTRY.gauge("fleet_api_model_loaded", "1 if a model is loaded, else 0.")
+
 
 def load_model(path: str):
     global _model
+    start = time.perf_counter()
     if os.path.exists(path):
         _model = joblib.load(path)
     else:
         _model = None
+    MODEL_LOAD_SECONDS.set(time.perf_counter() - start)
+    MODEL_LOADED.set(1 if _model is not None else 0)
 
 
 @app.on_event("startup")
@@ -29,18 +51,42 @@ def startup_event():
     load_model(MODEL_PATH)
 
 
+@app.middleware("http")
+async def record_latency(request: Request, call_next):
+    start = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        return response
+    finally:
+        route = request.scope.get("route")
+        path = getattr(route, "path", "unmatched")
+        REQUEST_LATENCY.observe(time.perf_counter() - start, method=request.method, path=path, status=status)
+
+
 @app.get("/status")
 def status():
     return {"model_loaded": _model is not None, "model_path": MODEL_PATH}
 
 
+@app.get("/metrics")
+def metrics():
+    return Response(content=REGISTRY.render(), media_type=REGISTRY.CONTENT_TYPE)
+
+
 @app.post("/predict")
 def predict(req: PredictRequest):
     if _model is None:
         raise HTTPException(status_code=503, detail="Model not available. Train and place model at 'saved_models/latest_model.joblib'.")
+    n_rows = len(req.features)
+    BATCH_SIZE.observe(n_rows)
     try:
         df = pd.DataFrame(req.features)
+        start = time.perf_counter()
         preds = _model.predict(df)
+        PREDICT_SECONDS_PER_ROW.observe((time.perf_counter() - start) / max(n_rows, 1))
         return {"predictions": preds.tolist()}
     except Exception as e:
+        PREDICT_ERRORS.inc()
         raise HTTPException(status_code=400, detail=str(e))
@@ -1,4 +1,7 @@
 # automotive_dashboard.py
+import gzip
+import io
+
 import pandas as pd
 import streamlit as st
 import plotly.express as px
@@ -21,6 +24,11 @@ st.set_page_config(
     layout="wide"
 )
 
+# Large views are downsampled / paginated server-side so reruns stay fast
+MAX_SCATTER_POINTS = 5000
+TABLE_PAGE_SIZE = 500
+EXPORT_CHUNK_ROWS = 50_000
+
 # ===========================
 # Load Dataset
 # ===========================
@@ -40,20 +48,32 @@ selected_type = st.sidebar.multiselect("Select Vehicle Type", options=df["Vehicl
 selected_driver = st.sidebar.multiselect("Select Driver", options=df["Driver_Name"].unique(), default=df["Driver_Name"].unique())
 selected_month = st.sidebar.multiselect("Select Month", options=df["Month"].unique(), default=df["Month"].unique())
 
-# Filter dataframe
-filtered_df = df[
-    (df["Brand"].isin(selected_brand)) &
-    (df["Vehicle_Type"].isin(selected_type)) &
-    (df["Driver_Name"].isin(selected_driver)) &
-    (df["Month"].isin(selected_month))
-].copy()
+# Hashable filter state; every cached computation below is keyed on it
+filters = tuple(tuple(sorted(sel, key=str)) for sel in (selected_brand, selected_type, selected_driver, selected_month))
 
-# ===========================
-# Derived Metrics
-# ===========================
-filtered_df["Efficiency (km/L)"] = filtered_df["Mileage (km)"] / filtered_df["Fuel Used (L)"]
-filtered_df["Total Cost (€)"] = filtered_df["Fuel Used (L)"] * 1.8 + filtered_df["Maintenance Cost (€)"]  # assumed fuel price
-filtered_df["Cost per km (€)"] = filtered_df["Total Cost (€)"] / filtered_df["Mileage (km)"]
+
+@st.cache_resource(max_entries=8)
+def get_filtered(path, filters):
+    """Filtered frame with derived metrics. Shared (not copied) across reruns, so never mutate it."""
+    data = load_data(path)
+    brands, types, drivers, months = filters
+    out = data[
+        (data["Brand"].isin(brands)) &
+        (data["Vehicle_Type"].isin(types)) &
+        (data["Driver_Name"].isin(drivers)) &
+        (data["Month"].isin(months))
+    ].copy()
+
+    # ===========================
+    # Derived Metrics
+    # ===========================
+    out["Efficiency (km/L)"] = out["Mileage (km)"] / out["Fuel Used (L)"]
+    out["Total Cost (€)"] = out["Fuel Used (L)"] * 1.8 + out["Maintenance Cost (€)"]  # assumed fuel price
+    out["Cost per km (€)"] = out["Total Cost (€)"] / out["Mileage (km)"]
+    return out
+
+
+filtered_df = get_filtered(file_path, filters)
 
 # ===========================
 # Dashboard Title
@@ -61,47 +81,210 @@ filtered_df["Cost per km (€)"] = filtered_df["Total Cost (€)"] / filtered_df
 st.title("🚗 Vehicle Fleet Performance Dashboard")
 st.markdown("Interactive dashboard for analyzing and optimizing your vehicle fleet’s performance.")
 
+if filtered_df.empty:
+    st.warning("No rows match the current filters.")
+    st.stop()
+
 # ===========================
-# Tabs Layout
+# Section Layout
 # ===========================
-tab1, tab2, tab3, tab4, tab5 = st.tabs(["📊 Overview", "📈 Visualizations", "⚙️ Maintenance & Costs", "⬇️ Data Export", "🔮 Predictive Model"])
+# st.tabs executes every tab body on each rerun; a radio selector lets us run
+# only the visible section.
+SECTIONS = ["📊 Overview", "📈 Visualizations", "⚙️ Maintenance & Costs", "⬇️ Data Export", "🔮 Predictive Model"]
+section = st.radio("Section", SECTIONS, horizontal=True, label_visibility="collapsed")
+
+
+# Streamlit drops a widget's state on reruns where it isn't rendered, so
+# section widgets copy their value to a separate key and read it back as default.
+def _save_widget(key):
+    st.session_state[f"saved_{key}"] = st.session_state[key]
+
+
+def saved_widget_value(key, fallback):
+    return st.session_state.get(f"saved_{key}", fallback)
+
 
 # ===========================
-# TAB 1 - Overview (KPIs + Insights)
+# Cached per-filter computations
 # ===========================
-with tab1:
+@st.cache_data(max_entries=16)
+def overview_stats(path, filters):
+    data = get_filtered(path, filters)
+    # sort rather than idxmax: all-NaN efficiency must not raise
+    best = data.sort_values("Efficiency (km/L)", ascending=False).iloc[0]
+    return {
+        "vehicles": data["Vehicle ID"].nunique(),
+        "mileage": int(data["Mileage (km)"].sum()),
+        "fuel": int(data["Fuel Used (L)"].sum()),
+        "trips": int(data["Total Trips"].sum()),
+        "top_brand": data.groupby("Brand")["Mileage (km)"].sum().idxmax(),
+        "best_model": best["Model"],
+        "best_efficiency": best["Efficiency (km/L)"],
+        "avg_cost_per_km": data["Cost per km (€)"].mean(),
+    }
+
+
+@st.cache_data(max_entries=16)
+def visualization_data(path, filters):
+    data = get_filtered(path, filters)
+    scatter_cols = ["Mileage (km)", "Fuel Used (L)", "Vehicle_Type", "Total Trips", "Brand", "Model", "Driver_Name"]
+    scatter = data[scatter_cols]
+    if len(scatter) > MAX_SCATTER_POINTS:
+        scatter = scatter.sample(MAX_SCATTER_POINTS, random_state=42)
+    return {
+        "type_counts": data["Vehicle_Type"].value_counts().rename_axis("Vehicle_Type").reset_index(name="count"),
+        "brand_mileage": data.groupby("Brand")["Mileage (km)"].sum().reset_index(),
+        "monthly": (
+            data.groupby("Month")[["Mileage (km)", "Fuel Used (L)"]].sum().reset_index()
+            .sort_values("Month")
+        ),
+        "scatter": scatter,
+        "driver_efficiency": data.groupby("Driver_Name")["Efficiency (km/L)"].mean().reset_index(),
+        "routes": data.groupby(["Start_Station", "End_Station"])["Total Trips"].sum().reset_index(),
+        "corr": data[["Mileage (km)", "Fuel Used (L)", "Maintenance Cost (€)", "Total Trips", "Efficiency (km/L)"]].corr(),
+    }
+
+
+@st.cache_data(max_entries=16)
+def maintenance_data(path, filters):
+    data = get_filtered(path, filters)
+    return {
+        "model_maintenance": data.groupby("Model")["Maintenance Cost (€)"].sum().reset_index(),
+        "brand_cost_per_km": data.groupby("Brand")["Cost per km (€)"].mean().reset_index(),
+    }
+
+
+@st.cache_data(max_entries=4, show_spinner="Compressing export...")
+def build_export(path, filters):
+    """Gzip-compressed CSV of the filtered frame, serialized chunk by chunk."""
+    data = get_filtered(path, filters)
+    buf = io.BytesIO()
+    with gzip.GzipFile(fileobj=buf, mode="wb") as gz:
+        for start in range(0, len(data), EXPORT_CHUNK_ROWS):
+            chunk = data.iloc[start:start + EXPORT_CHUNK_ROWS]
+            gz.write(chunk.to_csv(index=False, header=start == 0).encode("utf-8"))
+    return buf.getvalue()
+
+
+@st.cache_data(max_entries=16, show_spinner="Training model...")
+def fit_model(path, filters, target_option, chosen):
+    # Basic feature engineering (create more factors)
+    df_model = get_filtered(path, filters).copy()
+    # avoid divide-by-zero
+    df_model["Total Trips"] = df_model["Total Trips"].replace(0, np.nan)
+    df_model["Avg Trip Distance (km)"] = df_model["Mileage (km)"] / df_model["Total Trips"]
+    df_model["Fuel per Trip (L)"] = df_model["Fuel Used (L)"] / df_model["Total Trips"]
+    df_model["Maintenance per km (€)"] = df_model["Maintenance Cost (€)"] / df_model["Mileage (km)"]
+    df_model["Month_Num"] = pd.to_datetime(df_model["Month"], errors="coerce").dt.month
+    # cyclic encoding for month
+    df_model["Month_sin"] = np.sin(2 * np.pi * (df_model["Month_Num"].fillna(0) / 12))
+    df_model["Month_cos"] = np.cos(2 * np.pi * (df_model["Month_Num"].fillna(0) / 12))
+
+    # Fill simple missing values
+    df_model["Avg Trip Distance (km)"] = df_model["Avg Trip Distance (km)"].fillna(df_model["Avg Trip Distance (km)"].median())
+    df_model["Fuel per Trip (L)"] = df_model["Fuel per Trip (L)"].fillna(df_model["Fuel per Trip (L)"].median())
+    df_model["Maintenance per km (€)"] = df_model["Maintenance per km (€)"].fillna(0)
+
+    chosen = list(chosen)
+    # Prepare data
+    model_df = df_model[[target_option] + chosen].dropna()
+    if model_df.shape[0] < 10:
+        return None
+
+    X = model_df[chosen]
+    y = model_df[target_option]
+
+    # identify numeric and categorical
+    numeric_feats = X.select_dtypes(include=[np.number]).columns.tolist()
+    categorical_feats = [c for c in chosen if c not in numeric_feats]
+
+    # Build preprocessing
+    numeric_transformer = Pipeline(steps=[("scaler", StandardScaler())])
+    categorical_transformer = Pipeline(steps=[
+        ("onehot", OneHotEncoder(handle_unknown="ignore", sparse=False))
+    ])
+
+    preprocessor = ColumnTransformer(transformers=[
+        ("num", numeric_transformer, numeric_feats),
+        ("cat", categorical_transformer, categorical_feats)
+    ], remainder="drop")
+
+    # ElasticNetCV to balance bias/variance (avoids overfitting vs underfitting)
+    model = Pipeline(steps=[
+        ("preproc", preprocessor),
+        ("clf", ElasticNetCV(l1_ratio=[0.1, 0.5, 0.9], cv=5, n_alphas=50, random_state=42))
+    ])
+
+    # Train/Test split
+    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
+    model.fit(X_train, y_train)
+
+    y_pred = model.predict(X_test)
+
+    # Important coefficients (for linear model)
+    coef_df = None
+    try:
+        # get feature names after preprocessing
+        preproc = model.named_steps["preproc"]
+        # numeric names
+        feature_names = []
+        if numeric_feats:
+            feature_names.extend(numeric_feats)
+        if categorical_feats:
+            # OneHotEncoder categories
+            ohe = preproc.named_transformers_["cat"].named_steps["onehot"]
+            cat_names = ohe.get_feature_names_out(categorical_feats).tolist()
+            feature_names.extend(cat_names)
+
+        coefs = model.named_steps["clf"].coef_
+        coef_df = pd.DataFrame({"feature": feature_names, "coef": coefs})
+        coef_df["abs_coef"] = coef_df["coef"].abs()
+        coef_df = coef_df.sort_values("abs_coef", ascending=False).head(20).reset_index(drop=True)
+    except Exception:
+        pass
+
+    return {
+        "rmse": np.sqrt(mean_squared_error(y_test, y_pred)),
+        "r2": r2_score(y_test, y_pred),
+        "y_test": y_test.to_numpy(),
+        "y_pred": y_pred,
+        "coef_df": coef_df,
+    }
+
+
+# ===========================
+# Overview (KPIs + Insights)
+# ===========================
+if section == SECTIONS[0]:
+    stats = overview_stats(file_path, filters)
+
     st.subheader("Key Metrics")
     col1, col2, col3, col4 = st.columns(4)
-    col1.metric("Total Vehicles", filtered_df["Vehicle ID"].nunique())
-    col2.metric("Total Mileage (km)", int(filtered_df["Mileage (km)"].sum()))
-    col3.metric("Total Fuel Used (L)", int(filtered_df["Fuel Used (L)"].sum()))
-    col4.metric("Total Trips", int(filtered_df["Total Trips"].sum()))
+    col1.metric("Total Vehicles", stats["vehicles"])
+    col2.metric("Total Mileage (km)", stats["mileage"])
+    col3.metric("Total Fuel Used (L)", stats["fuel"])
+    col4.metric("Total Trips", stats["trips"])
 
     st.markdown("---")
     st.subheader("📊 Automated Insights")
 
-    top_brand = filtered_df.groupby("Brand")["Mileage (km)"].sum().idxmax()
-    most_efficient_vehicle = (
-        filtered_df.assign(Efficiency=lambda x: x["Mileage (km)"] / x["Fuel Used (L)"])
-        .sort_values("Efficiency", ascending=False)
-        .iloc[0]
-    )
-
-    st.markdown(f"- **Top Brand by Total Mileage:** {top_brand}")
-    st.markdown(f"- **Most Fuel-Efficient Vehicle:** {most_efficient_vehicle['Model']} "
-                f"({most_efficient_vehicle['Efficiency (km/L)']:.2f} km/L)")
-    st.markdown(f"- **Average Cost per km:** €{filtered_df['Cost per km (€)'].mean():.2f}")
+    st.markdown(f"- **Top Brand by Total Mileage:** {stats['top_brand']}")
+    st.markdown(f"- **Most Fuel-Efficient Vehicle:** {stats['best_model']} "
+                f"({stats['best_efficiency']:.2f} km/L)")
+    st.markdown(f"- **Average Cost per km:** €{stats['avg_cost_per_km']:.2f}")
 
 # ===========================
-# TAB 2 - Visualizations
+# Visualizations
 # ===========================
-with tab2:
+elif section == SECTIONS[1]:
     st.subheader("Visualizations")
+    viz = visualization_data(file_path, filters)
 
-    # Vehicle count by type
-    fig_type = px.histogram(
-        filtered_df,
+    # Vehicle count by type (pre-aggregated rather than shipping every row to the browser)
+    fig_type = px.bar(
+        viz["type_counts"],
         x="Vehicle_Type",
+        y="count",
         title="Vehicles by Type",
         color="Vehicle_Type",
         text_auto=True
@@ -111,7 +294,7 @@ with tab2:
 
     # Mileage by Brand
     fig_mileage = px.bar(
-        filtered_df.groupby("Brand")["Mileage (km)"].sum().reset_index(),
+        viz["brand_mileage"],
         x="Brand",
         y="Mileage (km)",
         title="Total Mileage by Brand",
@@ -121,12 +304,8 @@ with tab2:
     st.plotly_chart(fig_mileage, use_container_width=True)
 
     # Monthly trends
-    monthly_df = (
-        filtered_df.groupby("Month")[["Mileage (km)", "Fuel Used (L)"]].sum().reset_index()
-        .sort_values("Month")
-    )
     fig_trend = px.line(
-        monthly_df,
+        viz["monthly"],
         x="Month",
         y=["Mileage (km)", "Fuel Used (L)"],
         title="Monthly Mileage and Fuel Usage Trends",
@@ -135,20 +314,23 @@ with tab2:
     st.plotly_chart(fig_trend, use_container_width=True)
 
     # Fuel usage vs Mileage scatter
+    scatter_title = "Mileage vs Fuel Usage"
+    if len(viz["scatter"]) < len(filtered_df):
+        scatter_title += f" (random sample of {len(viz['scatter']):,} of {len(filtered_df):,} rows)"
     fig_scatter = px.scatter(
-        filtered_df,
+        viz["scatter"],
         x="Mileage (km)",
         y="Fuel Used (L)",
         color="Vehicle_Type",
         size="Total Trips",
         hover_data=["Brand", "Model", "Driver_Name"],
-        title="Mileage vs Fuel Usage"
+        title=scatter_title
     )
     st.plotly_chart(fig_scatter, use_container_width=True)
 
     # Fuel efficiency per driver
     fig_efficiency = px.bar(
-        filtered_df.groupby("Driver_Name")["Efficiency (km/L)"].mean().reset_index(),
+        viz["driver_efficiency"],
         x="Driver_Name",
         y="Efficiency (km/L)",
         title="Average Fuel Efficiency per Driver",
@@ -159,9 +341,8 @@ with tab2:
 
     # Trips per route
     st.subheader("Trips per Route")
-    route_df = filtered_df.groupby(["Start_Station", "End_Station"])["Total Trips"].sum().reset_index()
     fig_route = px.bar(
-        route_df,
+        viz["routes"],
         x="Start_Station",
         y="Total Trips",
         color="End_Station",
@@ -172,9 +353,8 @@ with tab2:
 
     # Correlation heatmap
     st.subheader("Correlation Heatmap")
-    corr_matrix = filtered_df[["Mileage (km)", "Fuel Used (L)", "Maintenance Cost (€)", "Total Trips", "Efficiency (km/L)"]].corr()
     fig_corr = px.imshow(
-        corr_matrix,
+        viz["corr"],
         text_auto=True,
         color_continuous_scale="RdBu_r",
         title="Correlation between Metrics"
@@ -182,14 +362,15 @@ with tab2:
     st.plotly_chart(fig_corr, use_container_width=True)
 
 # ===========================
-# TAB 3 - Maintenance & Cost Analysis
+# Maintenance & Cost Analysis
 # ===========================
-with tab3:
+elif section == SECTIONS[2]:
     st.subheader("Maintenance & Cost Analysis")
+    maint = maintenance_data(file_path, filters)
 
     # Maintenance cost by model
     fig_maint = px.bar(
-        filtered_df.groupby("Model")["Maintenance Cost (€)"].sum().reset_index(),
+        maint["model_maintenance"],
         x="Model",
         y="Maintenance Cost (€)",
         title="Maintenance Cost per Model",
@@ -200,7 +381,7 @@ with tab3:
 
     # Cost per km by brand
     fig_cost_eff = px.bar(
-        filtered_df.groupby("Brand")["Cost per km (€)"].mean().reset_index(),
+        maint["brand_cost_per_km"],
         x="Brand",
         y="Cost per km (€)",
         title="Average Operating Cost per km by Brand",
@@ -210,42 +391,46 @@ with tab3:
     st.plotly_chart(fig_cost_eff, use_container_width=True)
 
 # ===========================
-# TAB 4 - Data Export
+# Data Export
 # ===========================
-with tab4:
+elif section == SECTIONS[3]:
     st.subheader("Filtered Data Preview")
-    st.dataframe(filtered_df.reset_index(drop=True))
-    st.download_button(
-        label="📥 Download Filtered Data (CSV)",
-        data=filtered_df.to_csv(index=False).encode("utf-8"),
-        file_name="filtered_vehicle_data.csv",
-        mime="text/csv"
+
+    # Only one page of rows is sent to the browser
+    n_rows = len(filtered_df)
+    n_pages = max(1, -(-n_rows // TABLE_PAGE_SIZE))
+    page = st.number_input(
+        "Page", min_value=1, max_value=n_pages, value=min(saved_widget_value("export_page", 1), n_pages), step=1,
+        key="export_page", on_change=_save_widget, args=("export_page",)
     )
+    start = (int(page) - 1) * TABLE_PAGE_SIZE
+    stop = min(start + TABLE_PAGE_SIZE, n_rows)
+    st.dataframe(filtered_df.iloc[start:stop].reset_index(drop=True))
+    st.caption(f"Rows {start + 1:,}–{stop:,} of {n_rows:,} (page {int(page)} of {n_pages})")
+
+    # The export is only built on request, then cached for this filter state
+    if st.button("📦 Prepare Download (CSV, gzip)"):
+        st.session_state["export_filters"] = filters
+    if st.session_state.get("export_filters") == filters:
+        st.download_button(
+            label="📥 Download Filtered Data (CSV, gzip)",
+            data=build_export(file_path, filters),
+            file_name="filtered_vehicle_data.csv.gz",
+            mime="application/gzip"
+        )
 
 # ===========================
-# TAB 5 - Predictive Model
+# Predictive Model
 # ===========================
-with tab5:
+elif section == SECTIONS[4]:
     st.subheader("Predictive Model — Estimate Efficiency or Cost")
 
-    # Basic feature engineering (create more factors)
-    df_model = filtered_df.copy()
-    # avoid divide-by-zero
-    df_model["Total Trips"] = df_model["Total Trips"].replace(0, np.nan)
-    df_model["Avg Trip Distance (km)"] = df_model["Mileage (km)"] / df_model["Total Trips"]
-    df_model["Fuel per Trip (L)"] = df_model["Fuel Used (L)"] / df_model["Total Trips"]
-    df_model["Maintenance per km (€)"] = df_model["Maintenance Cost (€)"] / df_model["Mileage (km)"]
-    df_model["Month_Num"] = pd.to_datetime(df_model["Month"], errors="coerce").dt.month
-    # cyclic encoding for month
-    df_model["Month_sin"] = np.sin(2 * np.pi * (df_model["Month_Num"].fillna(0) / 12))
-    df_model["Month_cos"] = np.cos(2 * np.pi * (df_model["Month_Num"].fillna(0) / 12))
-
-    # Fill simple missing values
-    df_model["Avg Trip Distance (km)"].fillna(df_model["Avg Trip Distance (km)"].median(), inplace=True)
-    df_model["Fuel per Trip (L)"].fillna(df_model["Fuel per Trip (L)"].median(), inplace=True)
-    df_model["Maintenance per km (€)"].fillna(0, inplace=True)
-
-    target_option = st.selectbox("Select target", ["Efficiency (km/L)", "Cost per km (€)"])
+    target_options = ["Efficiency (km/L)", "Cost per km (€)"]
+    target_option = st.selectbox(
+        "Select target", target_options,
+        index=target_options.index(saved_widget_value("model_target", target_options[0])),
+        key="model_target", on_change=_save_widget, args=("model_target",)
+    )
 
     st.markdown("Choose features to include in the model (keep it simple to avoid overfitting):")
     candidate_features = [
@@ -254,54 +439,23 @@ with tab5:
         "Month_sin", "Month_cos", "Brand", "Vehicle_Type", "Driver_Name", "Model"
     ]
 
-    chosen = st.multiselect("Features", options=candidate_features, default=[
+    chosen = st.multiselect("Features", options=candidate_features, default=saved_widget_value("model_features", [
         "Avg Trip Distance (km)", "Fuel per Trip (L)", "Maintenance per km (€)", "Brand", "Vehicle_Type"
-    ])
+    ]), key="model_features", on_change=_save_widget, args=("model_features",))
 
     if len(chosen) == 0:
         st.warning("Select at least one feature to train the model.")
     else:
-        # Prepare data
-        model_df = df_model[[target_option] + chosen].dropna()
+        result = fit_model(file_path, filters, target_option, tuple(chosen))
 
-        if model_df.shape[0] < 10:
+        if result is None:
             st.warning("Not enough rows to train a reliable model. Try widening filters.")
         else:
-            X = model_df[chosen]
-            y = model_df[target_option]
-
-            # identify numeric and categorical
-            numeric_feats = X.select_dtypes(include=[np.number]).columns.tolist()
-            categorical_feats = [c for c in chosen if c not in numeric_feats]
-
-            # Build preprocessing
-            numeric_transformer = Pipeline(steps=[("scaler", StandardScaler())])
-            categorical_transformer = Pipeline(steps=[
-                ("onehot", OneHotEncoder(handle_unknown="ignore", sparse=False))
-            ])
-
-            preprocessor = ColumnTransformer(transformers=[
-                ("num", numeric_transformer, numeric_feats),
-                ("cat", categorical_transformer, categorical_feats)
-            ], remainder="drop")
-
-            # ElasticNetCV to balance bias/variance (avoids overfitting vs underfitting)
-            model = Pipeline(steps=[
-                ("preproc", preprocessor),
-                ("clf", ElasticNetCV(l1_ratio=[0.1, 0.5, 0.9], cv=5, n_alphas=50, random_state=42))
-            ])
-
-            # Train/Test split
-            X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
-            model.fit(X_train, y_train)
-
-            y_pred = model.predict(X_test)
-            rmse = np.sqrt(mean_squared_error(y_test, y_pred))
-            r2 = r2_score(y_test, y_pred)
+            y_test, y_pred = result["y_test"], result["y_pred"]
 
             st.markdown("**Model Performance (test set)**")
-            st.write(f"RMSE: {rmse:.4f}")
-            st.write(f"R^2: {r2:.4f}")
+            st.write(f"RMSE: {result['rmse']:.4f}")
+            st.write(f"R^2: {result['r2']:.4f}")
 
             # Plot actual vs predicted
             try:
@@ -312,26 +466,10 @@ with tab5:
                 st.write("Could not render prediction plot.")
 
             # Show important coefficients (for linear model)
-            try:
-                # get feature names after preprocessing
-                preproc = model.named_steps["preproc"]
-                # numeric names
-                feature_names = []
-                if numeric_feats:
-                    feature_names.extend(numeric_feats)
-                if categorical_feats:
-                    # OneHotEncoder categories
-                    ohe = preproc.named_transformers_["cat"].named_steps["onehot"]
-                    cat_names = ohe.get_feature_names_out(categorical_feats).tolist()
-                    feature_names.extend(cat_names)
-
-                coefs = model.named_steps["clf"].coef_
-                coef_df = pd.DataFrame({"feature": feature_names, "coef": coefs})
-                coef_df["abs_coef"] = coef_df["coef"].abs()
-                coef_df = coef_df.sort_values("abs_coef", ascending=False).head(20)
+            if result["coef_df"] is not None:
                 st.markdown("**Top feature coefficients**")
-                st.dataframe(coef_df.reset_index(drop=True))
-            except Exception:
+                st.dataframe(result["coef_df"])
+            else:
                 st.write("Could not extract feature coefficients for display.")
 
             st.markdown("---")
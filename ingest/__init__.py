@@ -1,3 +1,26 @@
 from .etl import validate_schema, clean_data, normalize_features, process_file
+from .validation import (
+    ColumnSpec,
+    Schema,
+    ValidationReport,
+    DataValidationError,
+    DEFAULT_SCHEMA,
+    validate_frame,
+    validate_file,
+    read_validated_csv,
+)
 
-__all__ = ["validate_schema", "clean_data", "normalize_features", "process_file"]
+__all__ = [
+    "validate_schema",
+    "clean_data",
+    "normalize_features",
+    "process_file",
+    "ColumnSpec",
+    "Schema",
+    "ValidationReport",
+    "DataValidationError",
+    "DEFAULT_SCHEMA",
+    "validate_frame",
+    "validate_file",
+    "read_validated_csv",
+]
@@ -4,14 +4,20 @@ from typing import Tuple
 import numpy as np
 import pandas as pd
 
+from instrumentation import stage, timed
+from .validation import DEFAULT_SCHEMA, Schema, read_validated_csv, validate_frame
+
 
 def validate_schema(df: pd.DataFrame) -> Tuple[bool, list]:
-    """Basic validation: ensure `vehicle_id` and `timestamp` exist."""
-    required = ["vehicle_id", "timestamp"]
-    missing = [c for c in required if c not in df.columns]
+    """Basic validation: ensure `vehicle_id` and `timestamp` exist.
+
+    Kept for compatibility; see `ingest.validation` for full schema checks.
+    """
+    missing = validate_frame(df, DEFAULT_SCHEMA).missing_columns
     return (len(missing) == 0), missing
 
 
+@timed("ingest.clean_data")
 def clean_data(df: pd.DataFrame) -> pd.DataFrame:
     """Clean telemetry DataFrame:
     - parse timestamps
@@ -20,29 +26,36 @@ def clean_data(df: pd.DataFrame) -> pd.DataFrame:
     - coerce negative numeric values to NaN and fill with median
     """
     df = df.copy()
-    if "timestamp" in df.columns:
-        df["timestamp"] = pd.to_datetime(df["timestamp"], errors="coerce")
+    with stage("ingest.clean.parse_timestamps", rows=len(df)):
+        if "timestamp" in df.columns:
+            df["timestamp"] = pd.to_datetime(df["timestamp"], errors="coerce")
 
     # remove rows without id or timestamp
-    drop_cols = [c for c in ("vehicle_id", "timestamp") if c in df.columns]
-    if drop_cols:
-        df = df.dropna(subset=drop_cols)
-
-    df = df.drop_duplicates()
-
-    num_cols = df.select_dtypes(include=[np.number]).columns.tolist()
-    for c in num_cols:
-        # negative values don't make sense for many telemetry features
-        df.loc[df[c] < 0, c] = np.nan
-        if df[c].notna().any():
-            med = df[c].median()
-            df[c] = df[c].fillna(med)
-        else:
-            df[c] = df[c].fillna(0)
+    with stage("ingest.clean.drop_missing", rows=len(df)) as rec:
+        drop_cols = [c for c in ("vehicle_id", "timestamp") if c in df.columns]
+        if drop_cols:
+            df = df.dropna(subset=drop_cols)
+        rec["rows_out"] = len(df)
+
+    with stage("ingest.clean.dedupe", rows=len(df)) as rec:
+        df = df.drop_duplicates()
+        rec["rows_out"] = len(df)
+
+    with stage("ingest.clean.median_fill", rows=len(df)):
+        num_cols = df.select_dtypes(include=[np.number]).columns.tolist()
+        for c in num_cols:
+            # negative values don't make sense for many telemetry features
+            df.loc[df[c] < 0, c] = np.nan
+            if df[c].notna().any():
+                med = df[c].median()
+                df[c] = df[c].fillna(med)
+            else:
+                df[c] = df[c].fillna(0)
 
     return df
 
 
+@timed("ingest.normalize_features")
 def normalize_features(df: pd.DataFrame, method: str = "zscore") -> pd.DataFrame:
     """Add normalized columns for numeric features. Two methods supported: `zscore` and `minmax`.
     Adds new columns with suffixes `_z` or `_scaled`.
@@ -63,15 +76,26 @@ def normalize_features(df: pd.DataFrame, method: str = "zscore") -> pd.DataFrame
     return df
 
 
-def process_file(input_path: str, output_path: str = None, normalize_method: str = "zscore"):
+def process_file(
+    input_path: str,
+    output_path: str = None,
+    normalize_method: str = "zscore",
+    schema: Schema = DEFAULT_SCHEMA,
+    chunksize: int = 100_000,
+    max_violations: int = 1,
+):
     """Read CSV, validate, clean, normalize, and optionally write out cleaned CSV.
 
-    Returns the cleaned DataFrame or path to written file.
+    The file is validated against `schema` chunk by chunk while it is read, so
+    invalid input raises `DataValidationError` (a `ValueError`) at the first
+    chunk that reaches `max_violations`, before any cleaning.
+
+    Returns the cleaned DataFrame or path to written file. Each stage emits a
+    structured log record (see `instrumentation.stage`).
     """
-    df = pd.read_csv(input_path)
-    ok, missing = validate_schema(df)
-    if not ok:
-        raise ValueError(f"Missing required columns: {missing}")
+    df = read_validated_csv(
+        input_path, schema, chunksize=chunksize, max_violations=max_violations
+    )
 
     df = clean_data(df)
     df = normalize_features(df, method=normalize_method)
@@ -79,7 +103,8 @@ def process_file(input_path: str, output_path: str = None, normalize_method: str
     if output_path:
         folder = os.path.dirname(output_path) or "."
         os.makedirs(folder, exist_ok=True)
-        df.to_csv(output_path, index=False)
+        with stage("ingest.write_csv", rows=len(df), path=output_path):
+            df.to_csv(output_path, index=False)
         return output_path
 
     return df
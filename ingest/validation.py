@@ -0,0 +1,312 @@
+"""Declarative data-quality checks for telemetry files.
+
+A `Schema` describes per-column expectations (type, range, allowed values,
+null budget) plus an optional per-vehicle monotonic timestamp rule. Checks are
+vectorized over whole columns and run chunk by chunk, so a file can be
+validated in streaming mode without loading it all into memory.
+"""
+import warnings
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import pandas as pd
+
+from instrumentation import stage
+
+DTYPES = (None, "numeric", "datetime")
+# Dtypes whose parsed values can be compared against `min`/`max`
+RANGE_DTYPES = ("numeric", "datetime")
+
+
+@dataclass
+class ColumnSpec:
+    """Expectations for a single column. Unset fields are not checked.
+
+    `min`/`max` require a `numeric` or `datetime` dtype and are coerced to
+    match it (floats or `pd.Timestamp`), as are `allowed` values for those
+    dtypes. Timezone-naive datetime bounds are read in the column's timezone.
+    """
+    dtype: Optional[str] = None
+    required: bool = False
+    min: Optional[float] = None
+    max: Optional[float] = None
+    allowed: Optional[Iterable] = None
+    max_null_frac: Optional[float] = None
+
+    def __post_init__(self):
+        if self.dtype not in DTYPES:
+            raise ValueError(f"Unsupported dtype {self.dtype!r}; expected one of {DTYPES}")
+        if (self.min is not None or self.max is not None) and self.dtype not in RANGE_DTYPES:
+            raise ValueError(f"min/max bounds require dtype in {RANGE_DTYPES}, got {self.dtype!r}")
+        coerce = pd.Timestamp if self.dtype == "datetime" else float
+        if self.min is not None:
+            self.min = coerce(self.min)
+        if self.max is not None:
+            self.max = coerce(self.max)
+        if self.allowed is not None:
+            self.allowed = [coerce(v) for v in self.allowed] if self.dtype in RANGE_DTYPES else list(self.allowed)
+
+    @property
+    def has_row_checks(self) -> bool:
+        return any(v is not None for v in (self.dtype, self.min, self.max, self.allowed, self.max_null_frac))
+
+
+@dataclass
+class Schema:
+    """Column specs plus an optional `(group_col, time_col)` monotonic rule."""
+    columns: Dict[str, ColumnSpec] = field(default_factory=dict)
+    monotonic: Optional[Tuple[str, str]] = None
+
+    @property
+    def required(self) -> List[str]:
+        cols = [c for c, spec in self.columns.items() if spec.required]
+        for c in self.monotonic or ():
+            if c not in cols:
+                cols.append(c)
+        return cols
+
+    @property
+    def has_row_checks(self) -> bool:
+        return self.monotonic is not None or any(s.has_row_checks for s in self.columns.values())
+
+
+# Matches the historical `validate_schema` contract: only the key columns must exist.
+DEFAULT_SCHEMA = Schema(columns={
+    "vehicle_id": ColumnSpec(required=True),
+    "timestamp": ColumnSpec(required=True),
+})
+
+
+@dataclass
+class ValidationReport:
+    """Compact result: violation counts keyed by `column:check` and sampled bad rows."""
+    rows: int = 0
+    missing_columns: List[str] = field(default_factory=list)
+    violations: Dict[str, int] = field(default_factory=dict)
+    samples: List[dict] = field(default_factory=list)
+    truncated: bool = False
+
+    @property
+    def ok(self) -> bool:
+        return not self.missing_columns and not self.violations
+
+    def summary(self) -> str:
+        if self.missing_columns:
+            return f"Missing required columns: {self.missing_columns}"
+        if not self.violations:
+            return f"OK ({self.rows} rows checked)"
+        parts = ", ".join(f"{k}={v}" for k, v in sorted(self.violations.items()))
+        scope = "first " if self.truncated else ""
+        return f"Data validation failed over {scope}{self.rows} rows: {parts}"
+
+
+class DataValidationError(ValueError):
+    """Raised when a file does not satisfy its schema; carries the report."""
+
+    def __init__(self, report: ValidationReport):
+        super().__init__(report.summary())
+        self.report = report
+
+
+def _parse_datetime(raw: pd.Series) -> pd.Series:
+    """Parse to datetime64, normalising mixed UTC offsets to UTC."""
+    try:
+        # pandas < 3 warns (and returns objects) on mixed offsets; we re-parse below
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", FutureWarning)
+            values = pd.to_datetime(raw, errors="coerce")
+    except ValueError:
+        values = None
+    if values is None or not pd.api.types.is_datetime64_any_dtype(values):
+        values = pd.to_datetime(raw, errors="coerce", utc=True)
+    return values
+
+
+def _align_tz(ts: pd.Timestamp, values: pd.Series) -> pd.Timestamp:
+    """Make a bound comparable with `values`, whether the column is tz-aware or naive."""
+    tz = getattr(values.dtype, "tz", None)
+    if tz is not None:
+        return ts.tz_localize(tz) if ts.tz is None else ts.tz_convert(tz)
+    return ts.tz_convert("UTC").tz_localize(None) if ts.tz is not None else ts
+
+
+class SchemaValidator:
+    """Accumulates a `ValidationReport` over successive chunks of one file."""
+
+    def __init__(self, schema: Schema, sample_size: int = 5):
+        self.schema = schema
+        self.sample_size = sample_size
+        self.report = ValidationReport()
+        self._null_counts: Dict[str, int] = {}
+        self._sampled: Dict[str, int] = {}
+        # last seen timestamp per group, carried across chunks
+        self._last_seen: Dict = {}
+
+    @property
+    def total_violations(self) -> int:
+        return sum(self.report.violations.values())
+
+    def check_columns(self, columns: Iterable[str]) -> bool:
+        present = set(columns)
+        self.report.missing_columns = [c for c in self.schema.required if c not in present]
+        return not self.report.missing_columns
+
+    def _record(self, column: str, check: str, mask: pd.Series, values: pd.Series):
+        n = int(mask.sum())
+        if not n:
+            return
+        key = f"{column}:{check}"
+        self.report.violations[key] = self.report.violations.get(key, 0) + n
+        room = self.sample_size - self._sampled.get(key, 0)
+        if room > 0:
+            bad = values[mask].head(room)
+            # index labels are kept as-is (numpy scalars unwrapped) so any index works
+            self.report.samples.extend(
+                {"row": getattr(i, "item", lambda: i)(), "column": column, "check": check, "value": v}
+                for i, v in bad.items()
+            )
+            self._sampled[key] = self._sampled.get(key, 0) + len(bad)
+
+    def update(self, chunk: pd.DataFrame):
+        self.report.rows += len(chunk)
+        parsed = {}
+        for col, spec in self.schema.columns.items():
+            if col not in chunk.columns:
+                continue
+            raw = chunk[col]
+            nulls = raw.isna()
+            self._null_counts[col] = self._null_counts.get(col, 0) + int(nulls.sum())
+
+            values = raw
+            lo, hi, allowed = spec.min, spec.max, spec.allowed
+            if spec.dtype == "numeric":
+                values = pd.to_numeric(raw, errors="coerce")
+                self._record(col, "type", values.isna() & ~nulls, raw)
+            elif spec.dtype == "datetime":
+                values = _parse_datetime(raw)
+                self._record(col, "type", values.isna() & ~nulls, raw)
+                parsed[col] = values
+                lo = None if lo is None else _align_tz(lo, values)
+                hi = None if hi is None else _align_tz(hi, values)
+                allowed = None if allowed is None else [_align_tz(v, values) for v in allowed]
+
+            # comparisons against NaN/NaT are False, so nulls and type failures
+            # never count as range errors
+            if lo is not None:
+                self._record(col, "min", values < lo, raw)
+            if hi is not None:
+                self._record(col, "max", values > hi, raw)
+            if allowed is not None:
+                self._record(col, "allowed", ~values.isin(allowed) & values.notna(), raw)
+
+        if self.schema.monotonic is not None:
+            self._check_monotonic(chunk, parsed.get(self.schema.monotonic[1]))
+
+    def _check_monotonic(self, chunk: pd.DataFrame, ts: Optional[pd.Series] = None):
+        group_col, time_col = self.schema.monotonic
+        if ts is None:
+            ts = _parse_datetime(chunk[time_col])
+        frame = pd.DataFrame({"group": chunk[group_col], "ts": ts}).dropna()
+        if frame.empty:
+            return
+        prev = frame.groupby("group", sort=False)["ts"].shift()
+        if self._last_seen:
+            prev = prev.fillna(frame["group"].map(self._last_seen))
+        mask = (frame["ts"] < prev).reindex(chunk.index, fill_value=False)
+        self._record(time_col, "monotonic", mask, chunk[time_col])
+        self._last_seen.update(frame.groupby("group", sort=False)["ts"].last().to_dict())
+
+    def finalize(self) -> ValidationReport:
+        rows = self.report.rows
+        for col, spec in self.schema.columns.items():
+            if spec.max_null_frac is None or not rows:
+                continue
+            nulls = self._null_counts.get(col, 0)
+            if nulls / rows > spec.max_null_frac:
+                self.report.violations[f"{col}:null_budget"] = nulls
+        return self.report
+
+
+def validate_frame(df: pd.DataFrame, schema: Schema = DEFAULT_SCHEMA, sample_size: int = 5) -> ValidationReport:
+    """Validate an in-memory DataFrame against `schema`."""
+    validator = SchemaValidator(schema, sample_size=sample_size)
+    if validator.check_columns(df.columns):
+        validator.update(df)
+    return validator.finalize()
+
+
+def _validated_chunks(validator: SchemaValidator, reader, max_violations: Optional[int]):
+    """Run `validator` over each chunk from `reader`, yielding chunks until the budget is hit."""
+    for chunk in reader:
+        validator.update(chunk)
+        yield chunk
+        if max_violations is not None and validator.total_violations >= max_violations:
+            validator.report.truncated = True
+            return
+
+
+def validate_file(
+    input_path: str,
+    schema: Schema = DEFAULT_SCHEMA,
+    chunksize: int = 100_000,
+    sample_size: int = 5,
+    max_violations: Optional[int] = None,
+) -> ValidationReport:
+    """Validate a CSV in streaming mode, reading only the schema's columns.
+
+    The header is checked first; row-level checks then run chunk by chunk and
+    stop early once `max_violations` is reached (the report is marked
+    `truncated`). Null budgets are evaluated over the rows actually read.
+    """
+    validator = SchemaValidator(schema, sample_size=sample_size)
+    with stage("ingest.validate", path=input_path) as rec:
+        header = pd.read_csv(input_path, nrows=0).columns
+        if validator.check_columns(header) and schema.has_row_checks:
+            usecols = [c for c in header if c in schema.columns or c in (schema.monotonic or ())]
+            reader = pd.read_csv(input_path, usecols=usecols, chunksize=chunksize)
+            for _ in _validated_chunks(validator, reader, max_violations):
+                pass
+        report = validator.finalize()
+        rec["rows"] = report.rows
+        rec["violations"] = sum(report.violations.values())
+    return report
+
+
+def read_validated_csv(
+    input_path: str,
+    schema: Schema = DEFAULT_SCHEMA,
+    chunksize: int = 100_000,
+    sample_size: int = 5,
+    max_violations: Optional[int] = 1,
+) -> pd.DataFrame:
+    """Load a CSV while validating it in the same chunked pass.
+
+    Raises `DataValidationError` as soon as the header is missing required
+    columns or a chunk pushes the violation count to `max_violations`, so a bad
+    file is not read to the end. Null budgets are checked once all rows are in.
+
+    Chunks are held until the file is known to be valid, so peak memory briefly
+    reaches about twice the frame size during the final concat (comparable to
+    pandas' own chunked parsing). The chunk list is released as soon as the
+    concat returns.
+    """
+    validator = SchemaValidator(schema, sample_size=sample_size)
+    with stage("ingest.read_csv", path=input_path) as rec:
+        header = pd.read_csv(input_path, nrows=0).columns
+        if not validator.check_columns(header):
+            raise DataValidationError(validator.finalize())
+
+        if schema.has_row_checks:
+            reader = pd.read_csv(input_path, chunksize=chunksize)
+            chunks = list(_validated_chunks(validator, reader, max_violations))
+            report = validator.finalize()
+            rec["violations"] = sum(report.violations.values())
+            if not report.ok:
+                rec["rows"] = report.rows
+                raise DataValidationError(report)
+            df = pd.concat(chunks) if chunks else pd.read_csv(input_path, nrows=0)
+            del chunks
+        else:
+            df = pd.read_csv(input_path)
+        rec["rows"] = len(df)
+    return df
@@ -0,0 +1,291 @@
+"""Lightweight stage timing and metrics used by the ingest pipeline, training and API.
+
+Everything here is standard library only and cheap enough to leave enabled:
+a stage costs a couple of `perf_counter`/`getrusage` calls and one read of
+`/proc/self/statm`, and metrics are plain in-process counters rendered in
+Prometheus text format on demand. When `tracemalloc` is already tracing, stages
+also report their own Python allocation peak.
+"""
+import abc
+import functools
+import json
+import logging
+import sys
+import threading
+import time
+import tracemalloc
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Dict, Iterable, Optional, Sequence, Tuple
+
+try:
+    import resource
+except ImportError:  # pragma: no cover - not available on Windows
+    resource = None
+
+logger = logging.getLogger("fleet.instrumentation")
+
+_MB = 1024 * 1024
+_local = threading.local()
+
+
+def _maxrss_bytes() -> Optional[int]:
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KB, macOS reports bytes
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def peak_memory_mb() -> Optional[float]:
+    """Process-lifetime peak resident set size in MB (None if unavailable)."""
+    peak = _maxrss_bytes()
+    return None if peak is None else round(peak / _MB, 2)
+
+
+def current_rss_mb() -> Optional[float]:
+    """Current resident set size in MB (Linux only; None elsewhere)."""
+    try:
+        with open("/proc/self/statm") as fh:
+            pages = int(fh.read().split()[1])
+    except (OSError, ValueError, IndexError):
+        return None
+    return round(pages * resource.getpagesize() / _MB, 2)
+
+
+def _count_rows(obj) -> Optional[int]:
+    try:
+        return len(obj)
+    except TypeError:
+        return None
+
+
+class _StageFrame:
+    __slots__ = ("maxrss", "traced_start", "traced_peak")
+
+    def __init__(self):
+        self.maxrss = _maxrss_bytes()
+        self.traced_start = None
+        self.traced_peak = 0
+
+
+def _stage_stack() -> list:
+    stack = getattr(_local, "stack", None)
+    if stack is None:
+        stack = _local.stack = []
+    return stack
+
+
+def _enter_tracing(frame: _StageFrame, parent: Optional[_StageFrame]):
+    current, peak = tracemalloc.get_traced_memory()
+    # keep the parent's peak before resetting it for this stage
+    if parent is not None and parent.traced_start is not None:
+        parent.traced_peak = max(parent.traced_peak, peak)
+    tracemalloc.reset_peak()
+    frame.traced_start = current
+
+
+def _exit_tracing(frame: _StageFrame, parent: Optional[_StageFrame]) -> int:
+    peak = max(tracemalloc.get_traced_memory()[1], frame.traced_peak)
+    if parent is not None and parent.traced_start is not None:
+        parent.traced_peak = max(parent.traced_peak, peak)
+    return peak - frame.traced_start
+
+
+@contextmanager
+def stage(name: str, rows: Optional[int] = None, **fields):
+    """Time a pipeline stage and emit one structured log record on exit.
+
+    Yields a dict; callers can set `record["rows"]` (or any extra field) inside
+    the block when the row count is only known afterwards.
+
+    Memory fields describe this stage, not the whole process: `maxrss_growth_mb`
+    is how far the stage raised the process RSS high-water mark, `rss_mb` is the
+    RSS on exit, and `traced_peak_mb` (only when tracemalloc is tracing) is the
+    stage's Python allocation peak above its starting level.
+    """
+    record = {"stage": name, "rows": rows}
+    record.update(fields)
+    stack = _stage_stack()
+    parent = stack[-1] if stack else None
+    frame = _StageFrame()
+    if tracemalloc.is_tracing():
+        _enter_tracing(frame, parent)
+    stack.append(frame)
+    start = time.perf_counter()
+    try:
+        yield record
+    finally:
+        elapsed = time.perf_counter() - start
+        stack.pop()
+        record["wall_s"] = round(elapsed, 6)
+        n = record.get("rows")
+        record["rows_per_s"] = round(n / elapsed, 1) if n and elapsed > 0 else None
+        maxrss = _maxrss_bytes()
+        record["maxrss_growth_mb"] = None if maxrss is None else round((maxrss - frame.maxrss) / _MB, 2)
+        record["rss_mb"] = current_rss_mb()
+        if frame.traced_start is not None and tracemalloc.is_tracing():
+            record["traced_peak_mb"] = round(_exit_tracing(frame, parent) / _MB, 2)
+        logger.info(json.dumps(record, default=str))
+
+
+def timed(name: Optional[str] = None):
+    """Decorator form of `stage`; rows are taken from the first argument's length."""
+    def decorator(func):
+        stage_name = name or func.__qualname__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            rows = _count_rows(args[0]) if args else None
+            with stage(stage_name, rows=rows):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+# ---------------------------------------------------------------------------
+# Prometheus-style metrics
+# ---------------------------------------------------------------------------
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: Tuple = ()) -> str:
+    pairs = list(zip(names, values)) + list(extra)
+    if not pairs:
+        return ""
+    body = ",".join('{}="{}"'.format(k, str(v).replace("\\", "\\\\").replace('"', '\\"')) for k, v in pairs)
+    return "{" + body + "}"
+
+
+def _format_value(v: float) -> str:
+    if v == float("inf"):
+        return "+Inf"
+    return repr(float(v))
+
+
+class _Metric(abc.ABC):
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> Tuple[str, ...]:
+        return tuple(str(labels.get(n, "")) for n in self.labelnames)
+
+    @abc.abstractmethod
+    def _samples(self):
+        """Return `(suffix, label_values, extra_labels, value)` tuples."""
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        for suffix, labels, extra, value in self._samples():
+            lines.append(f"{self.name}{suffix}{_format_labels(self.labelnames, labels, extra)} {_format_value(value)}")
+        return "\n".join(lines)
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1.0, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def _samples(self):
+        with self._lock:
+            items = sorted(self._values.items())
+        return [("_total", k, (), v) for k, v in items]
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def set(self, value: float, **labels):
+        with self._lock:
+            self._values[self._key(labels)] = float(value)
+
+    def _samples(self):
+        with self._lock:
+            items = sorted(self._values.items())
+        return [("", k, (), v) for k, v in items]
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # per label set: [bucket counts..., +Inf count], sum
+        self._values: Dict[Tuple[str, ...], list] = {}
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        idx = bisect_left(self.buckets, value)
+        with self._lock:
+            entry = self._values.get(key)
+            if entry is None:
+                entry = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0]
+            entry[0][idx] += 1
+            entry[1] += value
+
+    def _samples(self):
+        with self._lock:
+            items = sorted((k, (list(v[0]), v[1])) for k, v in self._values.items())
+        samples = []
+        for key, (counts, total) in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                samples.append(("_bucket", key, (("le", _format_value(bound)),), cumulative))
+            samples.append(("_sum", key, (), total))
+            samples.append(("_count", key, (), cumulative))
+        return samples
+
+
+class Registry:
+    """Holds metrics and renders them in the Prometheus text exposition format."""
+
+    CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+    def __init__(self):
+        self._metrics = {}
+
+    def _register(self, metric: _Metric) -> _Metric:
+        existing = self._metrics.get(metric.name)
+        if existing is not None:
+            if existing.kind != metric.kind or existing.labelnames != metric.labelnames:
+                raise ValueError(
+                    f"Metric {metric.name!r} already registered as {existing.kind} with labels "
+                    f"{existing.labelnames}; cannot re-register as {metric.kind} with labels {metric.labelnames}"
+                )
+            return existing
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Iterable[str] = ()) -> Counter:
+        return self._register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: Iterable[str] = ()) -> Gauge:
+        return self._register(Gauge(name, documentation, labelnames))
+
+    def histogram(self, name: str, documentation: str, labelnames: Iterable[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    def render(self) -> str:
+        return "\n".join(m.render() for m in self._metrics.values()) + "\n"
+
+
+REGISTRY = Registry()
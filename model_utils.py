@@ -8,6 +8,8 @@ from sklearn.linear_model import ElasticNetCV
 import joblib
 from typing import Tuple
 
+from instrumentation import stage
+
 
 def engineer_features(df: pd.DataFrame) -> pd.DataFrame:
     df = df.copy()
@@ -53,12 +55,14 @@ def train_and_save_model(X: pd.DataFrame, y: pd.Series, model_path: str) -> str:
 
     Returns the path to the saved model.
     """
-    num, cat = split_numeric_categorical(X)
-    pipe = build_pipeline(num, cat)
-    pipe.fit(X, y)
-    folder = os.path.dirname(model_path) or "."
-    os.makedirs(folder, exist_ok=True)
-    joblib.dump(pipe, model_path)
+    with stage("train.fit", rows=len(X), features=X.shape[1]):
+        num, cat = split_numeric_categorical(X)
+        pipe = build_pipeline(num, cat)
+        pipe.fit(X, y)
+    with stage("train.save", path=model_path):
+        folder = os.path.dirname(model_path) or "."
+        os.makedirs(folder, exist_ok=True)
+        joblib.dump(pipe, model_path)
     return model_path
 
 
@@ -1,5 +1,6 @@
 """Simple CLI to run the ingest pipeline on a CSV file."""
 import argparse
+import logging
 
 from ingest import process_file
 
@@ -10,6 +11,7 @@ def main():
     p.add_argument("--output", "-o", help="Output cleaned CSV path (optional)")
     p.add_argument("--method", "-m", choices=["zscore", "minmax"], default="zscore", help="Normalization method")
     args = p.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
 
     out = process_file(args.input, output_path=args.output, normalize_method=args.method)
     print(f"Ingest complete. Output: {out}")
@@ -0,0 +1,119 @@
+import json
+import logging
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from instrumentation import Registry, stage, timed
+from ingest import clean_data
+
+
+def test_stage_emits_structured_record(caplog):
+    with caplog.at_level(logging.INFO, logger="fleet.instrumentation"):
+        with stage("unit.test", rows=100) as rec:
+            rec["extra"] = "x"
+    record = json.loads(caplog.records[-1].getMessage())
+    assert record["stage"] == "unit.test"
+    assert record["rows"] == 100
+    assert record["extra"] == "x"
+    assert record["wall_s"] >= 0
+    assert "rows_per_s" in record and "maxrss_growth_mb" in record and "rss_mb" in record
+
+
+def test_stage_reports_its_own_traced_peak(caplog):
+    import tracemalloc
+
+    tracemalloc.start()
+    try:
+        with caplog.at_level(logging.INFO, logger="fleet.instrumentation"):
+            with stage("unit.outer"):
+                with stage("unit.alloc"):
+                    buf = bytearray(8 * 1024 * 1024)
+                del buf
+                with stage("unit.noop"):
+                    pass
+    finally:
+        tracemalloc.stop()
+    records = {r["stage"]: r for r in (json.loads(rec.getMessage()) for rec in caplog.records)}
+    assert records["unit.alloc"]["traced_peak_mb"] >= 8
+    assert records["unit.noop"]["traced_peak_mb"] < 1
+    # the outer stage still sees the nested allocation peak
+    assert records["unit.outer"]["traced_peak_mb"] >= 8
+
+
+def test_timed_uses_first_argument_length(caplog):
+    @timed("unit.timed")
+    def passthrough(df):
+        return df
+
+    with caplog.at_level(logging.INFO, logger="fleet.instrumentation"):
+        passthrough(pd.DataFrame({"a": [1, 2, 3]}))
+    record = json.loads(caplog.records[-1].getMessage())
+    assert record["stage"] == "unit.timed"
+    assert record["rows"] == 3
+
+
+def test_clean_data_logs_each_stage(caplog):
+    df = pd.DataFrame({"vehicle_id": ["V1", "V1"], "timestamp": ["2021-01-01", "2021-01-01"], "mileage_km": [1, 1]})
+    with caplog.at_level(logging.INFO, logger="fleet.instrumentation"):
+        clean_data(df)
+    stages = [json.loads(r.getMessage())["stage"] for r in caplog.records]
+    assert "ingest.clean.dedupe" in stages
+    assert "ingest.clean.median_fill" in stages
+    assert stages[-1] == "ingest.clean_data"
+
+
+def test_registry_renders_prometheus_text():
+    reg = Registry()
+    hist = reg.histogram("req_seconds", "Latency.", ["path"], buckets=(0.1, 1.0))
+    hist.observe(0.05, path="/predict")
+    hist.observe(0.5, path="/predict")
+    reg.counter("errors", "Errors.").inc()
+    reg.gauge("load_seconds", "Load.").set(1.5)
+
+    text = reg.render()
+    assert "# TYPE req_seconds histogram" in text
+    assert 'req_seconds_bucket{path="/predict",le="0.1"} 1.0' in text
+    assert 'req_seconds_bucket{path="/predict",le="+Inf"} 2.0' in text
+    assert 'req_seconds_count{path="/predict"} 2.0' in text
+    assert "errors_total 1.0" in text
+    assert "load_seconds 1.5" in text
+
+
+def test_registry_rejects_conflicting_registration():
+    reg = Registry()
+    hist = reg.histogram("latency", "Latency.", ["path"])
+    assert reg.histogram("latency", "Latency.", ["path"]) is hist
+    with pytest.raises(ValueError):
+        reg.counter("latency", "Latency.")
+    with pytest.raises(ValueError):
+        reg.histogram("latency", "Latency.", ["method"])
+
+
+class _StubModel:
+    def predict(self, df):
+        return np.zeros(len(df))
+
+
+def test_metrics_endpoint_reports_predict_and_latency(monkeypatch):
+    pytest.importorskip("fastapi")
+    pytest.importorskip("httpx")
+    from fastapi.testclient import TestClient
+    from api import predict as api
+
+    monkeypatch.setattr(api, "_model", _StubModel())
+    client = TestClient(api.app)
+
+    resp = client.post("/predict", json={"features": [{"a": 1}, {"a": 2}, {"a": 3}]})
+    assert resp.status_code == 200
+    assert client.get("/vehicles/V123").status_code == 404
+
+    metrics = client.get("/metrics")
+    assert metrics.headers["content-type"].startswith("text/plain; version=0.0.4")
+    text = metrics.text
+    assert 'fleet_api_predict_batch_size_bucket{le="5.0"}' in text
+    assert "fleet_api_predict_seconds_per_row_count" in text
+    assert 'fleet_api_request_duration_seconds_count{method="POST",path="/predict",status="200"}' in text
+    assert 'path="unmatched",status="404"' in text
+    assert "/vehicles/V123" not in text
@@ -0,0 +1,164 @@
+import pandas as pd
+import pytest
+
+from ingest import (
+    ColumnSpec,
+    DataValidationError,
+    Schema,
+    process_file,
+    read_validated_csv,
+    validate_file,
+    validate_frame,
+)
+
+
+def telemetry_schema():
+    return Schema(
+        columns={
+            "vehicle_id": ColumnSpec(required=True, max_null_frac=0.0),
+            "timestamp": ColumnSpec(dtype="datetime", required=True),
+            "mileage_km": ColumnSpec(dtype="numeric", min=0, max=1_000_000),
+            "status": ColumnSpec(allowed=["ok", "service"]),
+        },
+        monotonic=("vehicle_id", "timestamp"),
+    )
+
+
+def sample_df():
+    return pd.DataFrame({
+        "vehicle_id": ["V1", "V2", "V1", None, "V2"],
+        "timestamp": ["2021-01-02", "2021-01-01", "2021-01-01", "2021-01-03", "2021-01-05"],
+        "mileage_km": [100, -5, "abc", 10, 2_000_000],
+        "status": ["ok", "service", "broken", None, "ok"],
+    })
+
+
+def test_validate_frame_counts_each_check():
+    report = validate_frame(sample_df(), telemetry_schema())
+    assert not report.ok
+    assert report.rows == 5
+    assert report.violations["mileage_km:type"] == 1
+    assert report.violations["mileage_km:min"] == 1
+    assert report.violations["mileage_km:max"] == 1
+    assert report.violations["status:allowed"] == 1
+    assert report.violations["timestamp:monotonic"] == 1
+    assert report.violations["vehicle_id:null_budget"] == 1
+    bad_rows = {(s["column"], s["check"]): s["row"] for s in report.samples}
+    assert bad_rows[("timestamp", "monotonic")] == 2
+
+
+def test_validate_frame_passes_clean_data():
+    df = pd.DataFrame({
+        "vehicle_id": ["V1", "V1", "V2"],
+        "timestamp": ["2021-01-01", "2021-01-02", "2021-01-01"],
+        "mileage_km": [1, 2, 3],
+        "status": ["ok", "ok", "service"],
+    })
+    report = validate_frame(df, telemetry_schema())
+    assert report.ok, report.summary()
+
+
+def test_validate_file_streaming_matches_in_memory(tmp_path):
+    inp = tmp_path / "in.csv"
+    sample_df().to_csv(inp, index=False)
+    streamed = validate_file(str(inp), telemetry_schema(), chunksize=2)
+    whole = validate_frame(pd.read_csv(inp), telemetry_schema())
+    assert streamed.violations == whole.violations
+    assert streamed.rows == 5
+
+
+def test_validate_file_stops_at_max_violations(tmp_path):
+    inp = tmp_path / "in.csv"
+    sample_df().to_csv(inp, index=False)
+    report = validate_file(str(inp), telemetry_schema(), chunksize=2, max_violations=1)
+    assert report.truncated
+    assert report.rows < 5
+
+
+def test_process_file_fails_fast(tmp_path):
+    inp = tmp_path / "in.csv"
+    sample_df().to_csv(inp, index=False)
+    with pytest.raises(DataValidationError) as exc:
+        process_file(str(inp), str(tmp_path / "out.csv"), schema=telemetry_schema())
+    assert "mileage_km:min=1" in str(exc.value)
+    assert not (tmp_path / "out.csv").exists()
+
+
+def test_process_file_missing_columns(tmp_path):
+    inp = tmp_path / "in.csv"
+    pd.DataFrame({"vehicle_id": ["V1"]}).to_csv(inp, index=False)
+    with pytest.raises(ValueError, match="Missing required columns"):
+        process_file(str(inp))
+
+
+def test_range_bounds_require_comparable_dtype():
+    with pytest.raises(ValueError, match="min/max bounds require dtype"):
+        ColumnSpec(min=0)
+    with pytest.raises(ValueError, match="Unsupported dtype"):
+        ColumnSpec(dtype="string")
+
+
+def test_numeric_range_on_string_column_does_not_crash():
+    df = pd.DataFrame({"vehicle_id": ["V1"] * 3, "timestamp": ["2021-01-01"] * 3, "speed": ["10", "-1", "fast"]})
+    schema = Schema(columns={"speed": ColumnSpec(dtype="numeric", min="0")})
+    report = validate_frame(df, schema)
+    assert report.violations == {"speed:type": 1, "speed:min": 1}
+
+
+def test_datetime_range_bounds_are_coerced():
+    df = pd.DataFrame({"timestamp": ["2020-12-31", "2021-06-01", "2022-01-02", "nope"]})
+    schema = Schema(columns={"timestamp": ColumnSpec(dtype="datetime", min="2021-01-01", max="2021-12-31")})
+    assert schema.columns["timestamp"].min == pd.Timestamp("2021-01-01")
+    report = validate_frame(df, schema)
+    assert report.violations == {"timestamp:type": 1, "timestamp:min": 1, "timestamp:max": 1}
+
+
+def test_read_validated_csv_single_pass_returns_all_rows(tmp_path):
+    inp = tmp_path / "in.csv"
+    df = pd.DataFrame({
+        "vehicle_id": ["V1", "V1", "V2", "V2", "V3"],
+        "timestamp": ["2021-01-01", "2021-01-02", "2021-01-01", "2021-01-03", "2021-01-01"],
+        "mileage_km": [1, 2, 3, 4, 5],
+        "status": ["ok"] * 5,
+    })
+    df.to_csv(inp, index=False)
+    out = read_validated_csv(str(inp), telemetry_schema(), chunksize=2)
+    assert out.shape == df.shape
+    assert list(out["mileage_km"]) == [1, 2, 3, 4, 5]
+
+
+def test_read_validated_csv_stops_at_first_bad_chunk(tmp_path):
+    inp = tmp_path / "in.csv"
+    bad = pd.DataFrame({"vehicle_id": ["V1"] * 10, "timestamp": ["2021-01-01"] * 10, "mileage_km": [-1] + [1] * 9})
+    bad.to_csv(inp, index=False)
+    with pytest.raises(DataValidationError) as exc:
+        read_validated_csv(str(inp), telemetry_schema(), chunksize=2)
+    assert exc.value.report.truncated
+    assert exc.value.report.rows == 2
+
+
+def test_numeric_allowed_compares_parsed_values(tmp_path):
+    inp = tmp_path / "in.csv"
+    pd.DataFrame({"gear": ["1", "2", "x", "3"]}).to_csv(inp, index=False)
+    schema = Schema(columns={"gear": ColumnSpec(dtype="numeric", allowed=[1, 2])})
+    report = validate_file(str(inp), schema)
+    assert report.violations == {"gear:type": 1, "gear:allowed": 1}
+
+    report = validate_frame(pd.DataFrame({"gear": ["1", "3"]}), schema)
+    assert report.violations == {"gear:allowed": 1}
+
+
+def test_samples_keep_non_integer_index_labels():
+    df = pd.DataFrame({"x": [1, -1]}, index=["a", "b"])
+    report = validate_frame(df, Schema(columns={"x": ColumnSpec(dtype="numeric", min=0)}))
+    assert report.violations == {"x:min": 1}
+    assert report.samples[0]["row"] == "b"
+
+
+def test_datetime_bounds_against_tz_aware_column():
+    df = pd.DataFrame({"timestamp": ["2020-12-31T23:00:00+01:00", "2021-01-01T12:00:00+01:00"]})
+    schema = Schema(columns={"timestamp": ColumnSpec(dtype="datetime", min="2021-01-01")})
+    assert validate_frame(df, schema).violations == {"timestamp:min": 1}
+
+    mixed = pd.DataFrame({"timestamp": ["2021-01-01T12:00:00+01:00", "2021-06-01T12:00:00+02:00", "2020-06-01T00:00:00+02:00"]})
+    assert validate_frame(mixed, schema).violations == {"timestamp:min": 1}
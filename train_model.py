@@ -1,4 +1,5 @@
 import argparse
+import logging
 import pandas as pd
 from model_utils import engineer_features, train_and_save_model
 
@@ -9,6 +10,7 @@ def main():
     parser.add_argument("--target", "-t", default=None, help="Target column name (default: Failure or Mileage (km))")
     parser.add_argument("--output", "-o", default="saved_models/latest_model.joblib", help="Output model path")
     args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
 
     df = pd.read_csv(args.input)
     df = engineer_features(df)